@@ -18,13 +18,14 @@ import socket
 import ctypes
 import ctypes.wintypes
 import os
-from typing import Awaitable, Callable, Optional, Tuple
+from typing import Awaitable, BinaryIO, Callable, Optional, Tuple
 
 __all__ = [
     "UNIX_PATH_MAX",
     "WindowsUnixServer",
     "ensure_wsa_started",
     "open_unix_connection",
+    "sendfile",
     "start_unix_server",
 ]
 
@@ -36,7 +37,25 @@ UNIX_PATH_MAX = 108
 class Sockaddr(ctypes.Structure):
     _fields_ = [
         ("sun_family", ctypes.wintypes.USHORT),
-        ("sun_data", ctypes.wintypes.CHAR * UNIX_PATH_MAX),
+        ("sun_data", ctypes.c_ubyte * UNIX_PATH_MAX),
+    ]
+
+_SUN_DATA_OFFSET = Sockaddr.sun_data.offset
+
+def _make_sockaddr(family: int, enc: bytes) -> Sockaddr:
+    """Build a sockaddr_un for an already-encoded path."""
+    if len(enc) >= UNIX_PATH_MAX:
+        raise ValueError("socket path too long")
+    # Sockaddr() is zero-initialised, so copying the path in leaves it NUL-terminated
+    sockaddr = Sockaddr()
+    sockaddr.sun_family = family
+    ctypes.memmove(ctypes.addressof(sockaddr) + _SUN_DATA_OFFSET, enc, len(enc))
+    return sockaddr
+
+class WSANETWORKEVENTS(ctypes.Structure):
+    _fields_ = [
+        ("lNetworkEvents", ctypes.c_long),
+        ("iErrorCode", ctypes.c_int * 10),
     ]
 
 class WSAData(ctypes.Structure):
@@ -52,6 +71,9 @@ class WSAData(ctypes.Structure):
 
 ws2_32 = ctypes.windll.ws2_32
 
+# SOCKET is UINT_PTR: pointer-sized and unsigned, not a HANDLE or a C int
+SOCKET = ctypes.c_size_t
+
 # prototypes used
 ws2_32.WSAStartup.restype = ctypes.c_int
 ws2_32.WSAStartup.argtypes = (ctypes.wintypes.WORD, ctypes.POINTER(WSAData))
@@ -62,37 +84,74 @@ ws2_32.WSACreateEvent.argtypes = ()
 ws2_32.WSAResetEvent.restype = ctypes.wintypes.BOOL
 ws2_32.WSAResetEvent.argtypes = (ctypes.wintypes.HANDLE, )
 
+ws2_32.WSACloseEvent.restype = ctypes.wintypes.BOOL
+ws2_32.WSACloseEvent.argtypes = (ctypes.wintypes.HANDLE, )
+
 ws2_32.WSAEventSelect.restype = ctypes.c_int
-ws2_32.WSAEventSelect.argtypes = (ctypes.wintypes.HANDLE, ctypes.wintypes.HANDLE, ctypes.c_long)
+ws2_32.WSAEventSelect.argtypes = (SOCKET, ctypes.wintypes.HANDLE, ctypes.c_long)
+
+ws2_32.WSAEnumNetworkEvents.restype = ctypes.c_int
+ws2_32.WSAEnumNetworkEvents.argtypes = (SOCKET, ctypes.wintypes.HANDLE, ctypes.POINTER(WSANETWORKEVENTS))
 
 ws2_32.WSAWaitForMultipleEvents.restype = ctypes.wintypes.DWORD
 ws2_32.WSAWaitForMultipleEvents.argtypes = (ctypes.wintypes.DWORD, ctypes.POINTER(ctypes.wintypes.HANDLE), ctypes.wintypes.BOOL, ctypes.wintypes.DWORD, ctypes.wintypes.BOOL)
 
 ws2_32.bind.restype = ctypes.wintypes.INT
-ws2_32.bind.argtypes = (ctypes.wintypes.HANDLE, ctypes.POINTER(Sockaddr), ctypes.c_int)
+ws2_32.bind.argtypes = (SOCKET, ctypes.POINTER(Sockaddr), ctypes.c_int)
 
-ws2_32.accept.restype = ctypes.c_int
-ws2_32.accept.argtypes = (ctypes.wintypes.HANDLE, ctypes.POINTER(Sockaddr), ctypes.POINTER(ctypes.c_int))
+ws2_32.accept.restype = SOCKET
+ws2_32.accept.argtypes = (SOCKET, ctypes.POINTER(Sockaddr), ctypes.POINTER(ctypes.c_int))
 
 ws2_32.connect.restype = ctypes.c_int
-ws2_32.connect.argtypes = (ctypes.wintypes.HANDLE, ctypes.POINTER(Sockaddr), ctypes.c_int)
+ws2_32.connect.argtypes = (SOCKET, ctypes.POINTER(Sockaddr), ctypes.c_int)
 
-# c_uintptr = ctypes.POINTER(ctypes.c_uint)
-# ctypes.c_void_p
-ws2_32.socket.restype = ctypes.c_void_p  # SOCKET
+ws2_32.socket.restype = SOCKET
 ws2_32.socket.argtypes = (ctypes.c_int, ctypes.c_int, ctypes.c_int)
 
 ws2_32.closesocket.restype = ctypes.c_int
-ws2_32.closesocket.argtypes = (ctypes.c_void_p,)
+ws2_32.closesocket.argtypes = (SOCKET,)
 
 ws2_32.WSAGetLastError.restype = ctypes.c_int
 ws2_32.WSAGetLastError.argtypes = ()
 
+# bound once so the accept/connect paths skip the ws2_32 attribute lookup
+_accept = ws2_32.accept
+_connect = ws2_32.connect
+_socket = ws2_32.socket
+_closesocket = ws2_32.closesocket
+_WSAEnumNetworkEvents = ws2_32.WSAEnumNetworkEvents
+_WSAGetLastError = ws2_32.WSAGetLastError
+_WSAResetEvent = ws2_32.WSAResetEvent
+_WSAEventSelect = ws2_32.WSAEventSelect
+
 # constants
 FD_READ   = 0x01
 FD_WRITE  = 0x02
 FD_ACCEPT = 0x08
+FD_CLOSE  = 0x20
 WSA_INFINITE = 0xffffffff
+INVALID_SOCKET = SOCKET(-1).value  # ~0 as an unsigned SOCKET
+WSAEWOULDBLOCK = 10035
+WSAECONNRESET = 10054
+WSAEINVAL = 10022
+WSAENOTSOCK = 10038
+WSAEOPNOTSUPP = 10045
+# TransmitFile errors that mean the socket cannot use it at all
+_SENDFILE_UNSUPPORTED = (WSAEINVAL, WSAENOTSOCK, WSAEOPNOTSUPP)
+_AF_UNIX = getattr(socket, "AF_UNIX", 1)  # fallback to 1 if not present
+
+# SO_SNDBUF / SO_RCVBUF applied to every accepted or connected socket
+_DEFAULT_SOCK_BUF = 256 * 1024
+# transport high-water mark before StreamWriter.drain() blocks
+_WRITE_BUFFER_HIGH = 256 * 1024
+# StreamReader limit, matched to SO_RCVBUF so bulk reads do not pause early
+_STREAM_LIMIT = 256 * 1024
+# read size used by sendfile() when the kernel cannot send the file directly
+_SENDFILE_CHUNK = 64 * 1024
+
+# whether socket.AF_UNIX can reach Winsock AF_UNIX endpoints; None until
+# open_unix_connection() has found out
+_NATIVE_AFUNIX: Optional[bool] = None if hasattr(socket, "AF_UNIX") else False
 
 # --- utility: ensure WSA is started once ---
 _wsa_started = False
@@ -106,6 +165,28 @@ def ensure_wsa_started() -> None:
         raise OSError(f"WSAStartup failed: {ret}")
     _wsa_started = True
 
+# --- stream plumbing ---
+def _tune_socket(sock: socket.socket) -> None:
+    """Raise the kernel send/receive buffers above the small Winsock defaults."""
+    for opt in (socket.SO_SNDBUF, socket.SO_RCVBUF):
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, opt, _DEFAULT_SOCK_BUF)
+        except OSError:
+            # not every AF_UNIX provider accepts these options
+            pass
+
+async def _open_stream(sock: socket.socket, loop: asyncio.AbstractEventLoop) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Hand a connected non-blocking socket to asyncio and return (reader, writer)."""
+    _tune_socket(sock)
+    reader = asyncio.StreamReader(limit=_STREAM_LIMIT)
+    protocol = asyncio.StreamReaderProtocol(reader)
+    transport, _ = await loop.connect_accepted_socket(lambda: protocol, sock)
+    # writes issued while a send is in flight are coalesced into the transport
+    # buffer; a higher mark lets more of them batch before drain() pauses
+    transport.set_write_buffer_limits(high=_WRITE_BUFFER_HIGH)
+    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+    return reader, writer
+
 # --- high-level API classes / functions ---
 class WindowsUnixServer:
     """
@@ -114,10 +195,19 @@ class WindowsUnixServer:
     """
     def __init__(self, path: str, loop: Optional[asyncio.AbstractEventLoop] = None):
         self.path = path
-        self.loop = loop or asyncio.get_event_loop()
+        # both forms are derived together in start() from one snapshot of
+        # self.path: bind() uses the encoded one, unlink() the absolute one
+        self._path_enc: Optional[bytes] = None
+        self._path_abs: Optional[str] = None
+        self.loop = loop or asyncio.get_running_loop()
         self._sock: Optional[socket.socket] = None
         self._running = False
+        self._closed = False
         self._task: Optional[asyncio.Task] = None
+        self._accept_event = None
+        # reused for every WSAEnumNetworkEvents call in the accept loop
+        self._events_buf = WSANETWORKEVENTS()
+        self._events_buf_ref = ctypes.byref(self._events_buf)
         # ensure proactor exists (Windows default)
         if not hasattr(self.loop, "_proactor"):
             raise RuntimeError("This helper requires an asyncio ProactorEventLoop (Windows).")
@@ -129,30 +219,27 @@ class WindowsUnixServer:
         for each accepted connection. This call returns immediately after scheduling the accept loop.
         """
         ensure_wsa_started()
-        # prepare socket path
-        if os.path.exists(self.path):
-            try:
-                os.unlink(self.path)
-            except Exception:
-                pass
+        # a server may be restarted after close(); the next close() must tear it down again
+        self._closed = False
+        path = self.path
+        self._path_enc = path.encode("utf-8")
+        self._path_abs = os.path.abspath(path)
+        # prepare socket path (a missing file is the common case)
+        try:
+            os.unlink(self._path_abs)
+        except OSError:
+            pass
 
         # Create a Python socket. (We rely on the AF_UNIX value being available or monkeypatched by user.)
-        fam = getattr(socket, "AF_UNIX", 1)  # fallback to 1 if not present
+        fam = _AF_UNIX
+        # bind using ctypes to match user's strategy (avoid Python internals on Windows)
+        sockaddr = _make_sockaddr(fam, self._path_enc)
+        sockaddr_len = ctypes.sizeof(sockaddr)
+
         serv = socket.socket(fam, socket.SOCK_STREAM)
         serv.setblocking(False)
         self._sock = serv
 
-        # bind using ctypes to match user's strategy (avoid Python internals on Windows)
-        sockaddr = Sockaddr()
-        sockaddr.sun_family = fam
-        enc = self.path.encode("utf-8")
-        if len(enc) >= UNIX_PATH_MAX:
-            raise ValueError("socket path too long")
-        # sockaddr.sun_data[:len(enc)] = enc  # copy
-        tmp = bytearray(sockaddr.sun_data)          # バッファを mutable に取得
-        tmp[:len(enc)] = enc                        # 書き換え
-        sockaddr.sun_data = bytes(tmp)              # 再代入（固定長に自動切詰め/拡張）
-        sockaddr_len = ctypes.sizeof(sockaddr)
         # call winsock bind on fileno
         ret = ws2_32.bind(serv.fileno(), ctypes.byref(sockaddr), sockaddr_len)
         if ret != 0:
@@ -160,70 +247,107 @@ class WindowsUnixServer:
             raise OSError(f"bind failed: {ret}")
 
         serv.listen(5)
+
+        # one manual-reset event for the lifetime of the listener; the accept
+        # loop only resets it between waits instead of recreating it.
+        # WSAEventSelect is issued exactly once: the FD_ACCEPT
+        # selection stays armed on the socket across WSAResetEvent and
+        # WSAEnumNetworkEvents, and FD_ACCEPT is re-enabled by accept() itself.
+        # Re-issuing it is only needed to change the mask. FD_CLOSE is not
+        # selected: a listener never reports it, and accepted sockets inherit
+        # the mask, so it would only fire on client disconnects.
+        ev = ws2_32.WSACreateEvent()
+        if not ev:
+            raise OSError(f"WSACreateEvent failed, err={ws2_32.WSAGetLastError()}")
+        if ws2_32.WSAEventSelect(serv.fileno(), ev, FD_ACCEPT) != 0:
+            err = ws2_32.WSAGetLastError()
+            ws2_32.WSACloseEvent(ev)
+            raise OSError(f"WSAEventSelect failed, err={err}")
+        self._accept_event = ev
+
         self._running = True
         # create accept-loop task
         self._task = self.loop.create_task(self._accept_loop(client_connected_cb))
         return self
 
     async def _accept_loop(self, client_connected_cb):
+        # Not IocpProactor.accept(): _overlapped.AcceptEx reserves address space
+        # for sockaddr_in6 (+16 bytes) only, which is smaller than sockaddr_un,
+        # so AcceptEx cannot complete on an AF_UNIX listener through it.
         assert self._sock is not None
-        serv = self._sock
+        serv_fd = self._sock.fileno()
+        ev = self._accept_event
+        events = self._events_buf
+        events_ref = self._events_buf_ref
         while self._running:
-            # create WSA event for FD_ACCEPT
-            ev = ws2_32.WSACreateEvent()
-            if not ev:
-                await asyncio.sleep(0.1)
-                continue
-            # ask Winsock to signal the event when accept is possible
-            ws2_32.WSAEventSelect(serv.fileno(), ev, FD_ACCEPT)
             # wait for event via proactor
             try:
                 await self._proactor.wait_for_handle(ev)
             except Exception as e:
                 # proactor may raise on loop shutdown
-                ws2_32.WSAResetEvent(ev)
+                _WSAResetEvent(ev)
                 break
-            # reset event
-            try:
-                ws2_32.WSAResetEvent(ev)
-            except Exception:
-                pass
-
-            # accept via winsock accept (returns raw socket handle)
-            client_addr = Sockaddr()
-            client_addr_len = ctypes.c_int(ctypes.sizeof(client_addr))
-            client_fileno = ws2_32.accept(serv.fileno(), ctypes.byref(client_addr), ctypes.byref(client_addr_len))
-            if client_fileno == -1 or client_fileno == 0:
-                # nothing to accept or error
+            # read (and clear) the recorded network events; this also resets ev.
+            # lNetworkEvents is overwritten on every call, so the buffer needs no clearing
+            if _WSAEnumNetworkEvents(serv_fd, ev, events_ref) != 0:
+                _WSAResetEvent(ev)
                 await asyncio.sleep(0)
                 continue
-
-            # wrap into Python socket
-            try:
-                client_sock = socket.socket(fileno=client_fileno)
-                client_sock.setblocking(False)
-            except Exception as exc:
-                # close handle if we failed to wrap (best-effort)
-                try:
-                    ctypes.windll.kernel32.CloseHandle(ctypes.wintypes.HANDLE(client_fileno))
-                except Exception:
-                    pass
+            if not events.lNetworkEvents & FD_ACCEPT:
                 continue
 
-            # build StreamReader/Writer via StreamReaderProtocol + loop.connect_accepted_socket
-            reader = asyncio.StreamReader(limit=2**16, loop=self.loop)
-            protocol = asyncio.StreamReaderProtocol(reader)
+            # drain the whole backlog per wakeup: FD_ACCEPT is level-triggered and
+            # re-enabled by every accept() call, so this is not needed for
+            # correctness, but it saves one proactor round-trip per queued client
+            while self._running:
+                client_fileno = _accept(serv_fd, None, None)
+                if client_fileno == INVALID_SOCKET:
+                    err = _WSAGetLastError()
+                    if err == WSAEWOULDBLOCK:
+                        # backlog empty
+                        break
+                    if err == WSAECONNRESET:
+                        # peer gave up while queued; keep draining
+                        continue
+                    # anything else (e.g. WSAEMFILE, WSAENOBUFS) leaves the backlog
+                    # non-empty, so the event fires again at once; back off first
+                    await asyncio.sleep(0.1)
+                    break
+                await self._handle_accepted(client_fileno, client_connected_cb)
+
+    async def _handle_accepted(self, client_fileno, client_connected_cb):
+        # accepted sockets inherit the listener's event association; detach it
+        # so this connection never signals (or outlives) the accept event
+        _WSAEventSelect(client_fileno, None, 0)
+        # wrap into Python socket
+        try:
+            # explicit family/type skips CPython's SO_TYPE/SO_PROTOCOL lookups
+            # (it still calls getsockname() to validate the handle)
+            client_sock = socket.socket(_AF_UNIX, socket.SOCK_STREAM, 0, fileno=client_fileno)
+            client_sock.setblocking(False)
+        except Exception as exc:
+            # close handle if we failed to wrap (best-effort)
             try:
-                # connect_accepted_socket hands the socket to transport/protocol
-                transport, _ = await self.loop.connect_accepted_socket(lambda: protocol, client_sock)
+                _closesocket(client_fileno)
             except Exception:
-                client_sock.close()
-                continue
-            writer = asyncio.StreamWriter(transport, protocol, reader, self.loop)
-            # hand off to user's callback (don't await here to keep accepting)
-            self.loop.create_task(client_connected_cb(reader, writer))
+                pass
+            return
+
+        try:
+            # connect_accepted_socket hands the socket to transport/protocol
+            reader, writer = await _open_stream(client_sock, self.loop)
+        except Exception:
+            client_sock.close()
+            return
+        # hand off to user's callback (don't await here to keep accepting)
+        self.loop.create_task(client_connected_cb(reader, writer))
 
     async def close(self):
+        # flag first so a repeated close() is a no-op and never unlinks a path
+        # that another server may have bound in the meantime
+        if self._closed:
+            return
+        self._closed = True
         self._running = False
         if self._task:
             self._task.cancel()
@@ -236,12 +360,15 @@ class WindowsUnixServer:
                 self._sock.close()
             except Exception:
                 pass
-        # remove socket file if exists
-        try:
-            if os.path.exists(self.path):
-                os.unlink(self.path)
-        except Exception:
-            pass
+        if self._accept_event:
+            ws2_32.WSACloseEvent(self._accept_event)
+            self._accept_event = None
+        # remove socket file if exists (nothing to remove if start() never ran)
+        if self._path_abs is not None:
+            try:
+                os.unlink(self._path_abs)
+            except OSError:
+                pass
 
 # --- client helper: connect and return (reader, writer) ---
 async def open_unix_connection(path: str, loop: Optional[asyncio.AbstractEventLoop] = None) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
@@ -249,83 +376,107 @@ async def open_unix_connection(path: str, loop: Optional[asyncio.AbstractEventLo
     Try native AF_UNIX first; if not available, create a winsock socket
     and connect via ctypes, then wrap into a Python socket and hand to asyncio.
     """
-    loop = loop or asyncio.get_event_loop()
+    loop = loop or asyncio.get_running_loop()
     ensure_wsa_started()
 
     # 1) ネイティブ AF_UNIX が利用可能ならまずそれを試す（Windows 10+ Python で動く場合あり）
-    if hasattr(socket, "AF_UNIX"):
+    global _NATIVE_AFUNIX
+    native_failed = False
+    if _NATIVE_AFUNIX is not False:
+        sock = None
         try:
             sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
             sock.connect(path)   # may raise
             sock.setblocking(False)
-            reader = asyncio.StreamReader(limit=2**16, loop=loop)
-            protocol = asyncio.StreamReaderProtocol(reader)
-            transport, _ = await loop.connect_accepted_socket(lambda: protocol, sock)
-            writer = asyncio.StreamWriter(transport, protocol, reader, loop)
-            return reader, writer
+            streams = await _open_stream(sock, loop)
+            _NATIVE_AFUNIX = True
+            return streams
         except Exception:
             # ネイティブで失敗したらフォールバックへ（例: family mismatch）
-            try:
-                sock.close()
-            except Exception:
-                pass
+            native_failed = True
+            if sock is not None:
+                try:
+                    sock.close()
+                except Exception:
+                    pass
             # fall through to winsock ctypes path
 
     # 2) Winsock via ctypes path (フォールバック)
-    fam = getattr(socket, "AF_UNIX", 1)  # module 内で使っている numeric family と一致させる
+    fam = _AF_UNIX  # module 内で使っている numeric family と一致させる
+    # build sockaddr
+    sockaddr = _make_sockaddr(fam, path.encode("utf-8"))
+
     # create raw winsock socket
-    s_handle = ws2_32.socket(fam, socket.SOCK_STREAM, 0)
-    if s_handle == 0 or int(s_handle) == -1:
-        err = ws2_32.WSAGetLastError()
+    s_handle = _socket(fam, socket.SOCK_STREAM, 0)
+    if s_handle == INVALID_SOCKET:
+        err = _WSAGetLastError()
         raise OSError(f"WSA socket() failed, err={err}")
 
-    # build sockaddr
-    sockaddr = Sockaddr()
-    sockaddr.sun_family = fam
-    enc = path.encode("utf-8")
-    if len(enc) >= UNIX_PATH_MAX:
-        # cleanup
-        ws2_32.closesocket(s_handle)
-        raise ValueError("socket path too long")
-    # clear buffer then copy
-    tmp = bytearray(sockaddr.sun_data)          # バッファを mutable に取得
-    for i in range(UNIX_PATH_MAX):
-        tmp[i:i] = b"\x00"
-    # sockaddr.sun_data[:len(enc)] = enc
-    tmp[:len(enc)] = enc                        # 書き換え
-    sockaddr.sun_data = bytes(tmp)              # 再代入（固定長に自動切詰め/拡張）
-
     # connect
-    ret = ws2_32.connect(s_handle, ctypes.byref(sockaddr), ctypes.sizeof(sockaddr))
+    ret = _connect(s_handle, ctypes.byref(sockaddr), ctypes.sizeof(sockaddr))
     if ret != 0:
-        err = ws2_32.WSAGetLastError()
-        ws2_32.closesocket(s_handle)
+        err = _WSAGetLastError()
+        _closesocket(s_handle)
         raise OSError(f"ws2_32.connect failed, ret={ret}, WSAGetLastError={err}")
 
     # wrap raw SOCKET into Python socket object
     try:
-        py_sock = socket.socket(fileno=int(s_handle))
+        py_sock = socket.socket(fam, socket.SOCK_STREAM, 0, fileno=s_handle)
         py_sock.setblocking(False)
     except Exception as exc:
         try:
-            ws2_32.closesocket(s_handle)
+            _closesocket(s_handle)
         except Exception:
             pass
         raise
 
     # hand off to asyncio
-    reader = asyncio.StreamReader(limit=2**16, loop=loop)
-    protocol = asyncio.StreamReaderProtocol(reader)
-    transport, _ = await loop.connect_accepted_socket(lambda: protocol, py_sock)
-    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
-    return reader, writer
+    streams = await _open_stream(py_sock, loop)
+    if native_failed and _NATIVE_AFUNIX is None:
+        # the endpoint is reachable, so the native attempt failed for lack of
+        # support rather than a missing server; skip it from now on
+        _NATIVE_AFUNIX = False
+    return streams
 
 # --- convenience: start_server factory like asyncio.start_server ---
 async def start_unix_server(client_connected_cb: Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]],
                             path: str, loop: Optional[asyncio.AbstractEventLoop] = None) -> WindowsUnixServer:
-    loop = loop or asyncio.get_event_loop()
+    loop = loop or asyncio.get_running_loop()
     srv = WindowsUnixServer(path, loop=loop)
     await srv.start(client_connected_cb)
     return srv
 
+# --- bulk transfer: file -> stream ---
+async def sendfile(writer: asyncio.StreamWriter, file: BinaryIO, offset: int = 0, count: Optional[int] = None) -> int:
+    """
+    Send a regular binary file over writer's connection and return the number of bytes sent.
+    Uses loop.sendfile() (TransmitFile on the proactor) when the transport supports it; if
+    TransmitFile rejects the socket outright (as it may for AF_UNIX), falls back to chunked
+    reads written through the transport. Any other error is re-raised.
+    """
+    loop = asyncio.get_running_loop()
+    await writer.drain()
+    try:
+        return await loop.sendfile(writer.transport, file, offset, count, fallback=True)
+    except OSError as exc:
+        # TransmitFile sends the whole range in one call and leaves the file position
+        # untouched on failure, so a mid-transfer error cannot be told apart from an
+        # up-front one by position; only fall back on errors meaning "unsupported"
+        if writer.transport.is_closing() or getattr(exc, "winerror", None) not in _SENDFILE_UNSUPPORTED:
+            raise
+
+    # each chunk is a fresh bytes object: transports may keep a reference to
+    # unsent data, so a reused buffer could be overwritten before it is sent
+    file.seek(offset)
+    total_sent = 0
+    while count is None or total_sent < count:
+        size = _SENDFILE_CHUNK if count is None else min(_SENDFILE_CHUNK, count - total_sent)
+        data = await loop.run_in_executor(None, file.read, size)
+        if not data:
+            break
+        writer.write(data)
+        await writer.drain()
+        total_sent += len(data)
+    return total_sent
+
 # End of module